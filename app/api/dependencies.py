@@ -1,17 +1,41 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Depends, HTTPException, Request, status
+import hashlib
 import logging
 from app.core.security import decode_access_token
 from app.core.container import get_container, Container
+from app.core.ttl_cache import TTLCache
 
-security = HTTPBearer()
 logger = logging.getLogger(__name__)
 
+async def bearer_token(request: Request) -> str:
+    # Manual header split instead of HTTPBearer: avoids constructing and
+    # validating an HTTPAuthorizationCredentials model on every request
+    authorization = request.headers.get("authorization")
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+    return authorization[7:]
+
+# Short-lived cache of already-validated tokens. Clients reuse the same
+# bearer token across many requests, so on a hit we skip both the JWT
+# signature verification and the user lookup in Postgres. The 60s TTL keeps
+# deactivated users from lingering longer than a minute.
+_token_cache = TTLCache(maxsize=10000, ttl=60)
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token: str = Depends(bearer_token),
     container: Container = Depends(get_container)
 ):
-    token = credentials.credentials
+    cache_key = _token_cache_key(token)
+    cached_user = _token_cache.get(cache_key)
+    if cached_user is not None:
+        return cached_user
+
     payload = decode_access_token(token)
     
     if payload is None:
@@ -36,5 +60,6 @@ async def get_current_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
+
+    _token_cache.set(cache_key, user)
     return user
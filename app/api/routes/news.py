@@ -1,14 +1,98 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Optional, List
-from app.models.schemas import NewsResponse
+from datetime import datetime
+from uuid import UUID
+import hashlib
+import logging
+import orjson
 from app.api.dependencies import get_current_user
 from app.core.container import get_container, Container
+from app.core.redis import cache
+
+logger = logging.getLogger(__name__)
 
 # Create router for news endpoints with /news prefix
 router = APIRouter(prefix="/news", tags=["News"])
 
-@router.get("/category", response_model=NewsResponse, dependencies=[Depends(get_current_user)])
+# TTL for cached list responses. Articles only change on ingestion cadence,
+# so serving a 2-minute-old page skips Postgres and the LLM summarizer.
+NEWS_CACHE_TTL = 120
+
+def _articles_etag(articles) -> str:
+    """
+    Content tag derived from row identity: the article ids plus the newest
+    publication_date. This is known as soon as the repository returns, so
+    a matching If-None-Match can be answered with a 304 before any LLM
+    summarization runs; summaries never change the tag.
+    """
+    hasher = hashlib.blake2b(digest_size=8)
+    latest = ""
+    for article in articles:
+        if isinstance(article, dict):
+            article_id = article.get("id")
+            pub = article.get("publication_date")
+        else:
+            article_id = article.id
+            pub = article.publication_date
+        hasher.update(str(article_id).encode())
+        # isoformat matches orjson's datetime rendering, so fresh records
+        # and cache-parsed dicts produce the same tag for the same rows
+        pub_str = pub.isoformat() if isinstance(pub, datetime) else (pub or "")
+        if pub_str > latest:
+            latest = pub_str
+    hasher.update(latest.encode())
+    return f'"{hasher.hexdigest()}"'
+
+def etag_response(request: Request, payload: dict) -> Response:
+    """
+    Wrap a payload whose work is already done (cached responses) with the
+    row-identity ETag; a match still saves re-sending the body.
+    """
+    etag = _articles_etag(payload["articles"])
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(payload, headers={"ETag": etag})
+
+async def summarized_response(
+    request: Request,
+    news_service,
+    articles,
+    payload: dict,
+    cache_key: Optional[str] = None
+) -> Response:
+    """
+    Finish a freshly fetched page: check the conditional request first and
+    only run the LLM summarizer (and populate the response cache) when the
+    client actually needs the new body.
+    """
+    etag = _articles_etag(articles)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    await news_service.attach_summaries(articles)
+    if cache_key is not None:
+        await _set_cached_response(cache_key, payload)
+    return ORJSONResponse(payload, headers={"ETag": etag})
+
+async def _get_cached_response(cache_key: str):
+    try:
+        cached_data = await cache.get(cache_key)
+        if cached_data:
+            logger.info(f"Cache hit for news: {cache_key}")
+            return orjson.loads(cached_data)
+    except Exception as e:
+        logger.warning(f"Redis cache read failed: {e}")
+    return None
+
+async def _set_cached_response(cache_key: str, payload: dict):
+    try:
+        await cache.set(cache_key, orjson.dumps(payload, default=str).decode(), ex=NEWS_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Redis cache write failed: {e}")
+
+@router.get("/category", dependencies=[Depends(get_current_user)])
 async def get_news_by_category(
+    request: Request,
     category: str = Query(..., description="News category (e.g., Technology, Sports)"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(5, ge=1, le=50, description="Items per page"),
@@ -30,18 +114,58 @@ async def get_news_by_category(
     
     Example: GET /api/v1/news/category?category=Technology&page=1&limit=10
     """
+    cache_key = f"news:category:{category}:{page}:{limit}"
+    cached = await _get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
     offset = (page - 1) * limit
-    articles = await container.news_service.fetch_news(category=category, limit=limit, offset=offset)
-    return {
+    articles, total = await container.news_service.fetch_news(
+        category=category, limit=limit, offset=offset, summarize=False
+    )
+    payload = {
         "articles": articles,
-        "total": len(articles),
+        "total": total,
         "page": page,
         "page_size": limit,
         "query_info": {"category": category}
     }
+    return await summarized_response(request, container.news_service, articles, payload, cache_key)
 
-@router.get("/score", response_model=NewsResponse, dependencies=[Depends(get_current_user)])
+@router.get("/category/stream", dependencies=[Depends(get_current_user)])
+async def stream_news_by_category(
+    category: str = Query(..., description="News category (e.g., Technology, Sports)"),
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(5, ge=1, le=50, description="Items per page"),
+    container: Container = Depends(get_container)
+):
+    """
+    Stream News by Category (NDJSON)
+
+    Authentication: Required
+
+    Flow:
+    1. Fetch articles exactly like /news/category
+    2. Stream one orjson-encoded article per line (application/x-ndjson)
+
+    Use case: Large pages with long LLM summaries - the client can start
+    rendering the first article before the last one is serialized, and the
+    server never buffers the whole response body.
+
+    Example: GET /api/v1/news/category/stream?category=Technology&limit=50
+    """
+    offset = (page - 1) * limit
+    articles, _ = await container.news_service.fetch_news(category=category, limit=limit, offset=offset)
+
+    async def generate():
+        for article in articles:
+            yield orjson.dumps(article, default=str) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/score", dependencies=[Depends(get_current_user)])
 async def get_news_by_score(
+    request: Request,
     min_score: float = Query(0.7, ge=0, le=1, description="Minimum relevance score"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(5, ge=1, le=50, description="Items per page"),
@@ -64,18 +188,27 @@ async def get_news_by_score(
     
     Example: GET /api/v1/news/score?min_score=0.8&page=1&limit=5
     """
+    cache_key = f"news:score:{min_score}:{page}:{limit}"
+    cached = await _get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
     offset = (page - 1) * limit
-    articles = await container.news_service.fetch_news(min_score=min_score, limit=limit, offset=offset)
-    return {
+    articles, total = await container.news_service.fetch_news(
+        min_score=min_score, limit=limit, offset=offset, summarize=False
+    )
+    payload = {
         "articles": articles,
-        "total": len(articles),
+        "total": total,
         "page": page,
         "page_size": limit,
         "query_info": {"min_score": min_score}
     }
+    return await summarized_response(request, container.news_service, articles, payload, cache_key)
 
-@router.get("/source", response_model=NewsResponse, dependencies=[Depends(get_current_user)])
+@router.get("/source", dependencies=[Depends(get_current_user)])
 async def get_news_by_source(
+    request: Request,
     source_name: str = Query(..., description="News source name (e.g., Reuters, BBC)"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(5, ge=1, le=50, description="Items per page"),
@@ -95,18 +228,27 @@ async def get_news_by_source(
     
     Example: GET /api/v1/news/source?source_name=Reuters&page=1&limit=5
     """
+    cache_key = f"news:source:{source_name}:{page}:{limit}"
+    cached = await _get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
     offset = (page - 1) * limit
-    articles = await container.news_service.fetch_news(source_name=source_name, limit=limit, offset=offset)
-    return {
+    articles, total = await container.news_service.fetch_news(
+        source_name=source_name, limit=limit, offset=offset, summarize=False
+    )
+    payload = {
         "articles": articles,
-        "total": len(articles),
+        "total": total,
         "page": page,
         "page_size": limit,
         "query_info": {"source_name": source_name}
     }
+    return await summarized_response(request, container.news_service, articles, payload, cache_key)
 
-@router.get("/search", response_model=NewsResponse, dependencies=[Depends(get_current_user)])
+@router.get("/search", dependencies=[Depends(get_current_user)])
 async def search_news(
+    request: Request,
     query: str = Query(..., description="Search query"),
     category: Optional[str] = Query(None, description="Filter by category"),
     min_score: Optional[float] = Query(None, ge=0, le=1, description="Minimum relevance score"),
@@ -134,23 +276,26 @@ async def search_news(
     Example: GET /api/v1/news/search?query=climate+change&category=Science&page=1
     """
     offset = (page - 1) * limit
-    articles = await container.news_service.search_news(
+    articles, total = await container.news_service.search_news(
         query=query,
         category=category,
         min_score=min_score,
         limit=limit,
-        offset=offset
+        offset=offset,
+        summarize=False
     )
-    return {
+    payload = {
         "articles": articles,
-        "total": len(articles),
+        "total": total,
         "page": page,
         "page_size": limit,
         "query_info": {"query": query, "category": category, "min_score": min_score}
     }
+    return await summarized_response(request, container.news_service, articles, payload)
 
-@router.get("/nearby", response_model=NewsResponse, dependencies=[Depends(get_current_user)])
+@router.get("/nearby", dependencies=[Depends(get_current_user)])
 async def get_nearby_news(
+    request: Request,
     lat: float = Query(..., description="Latitude"),
     lon: float = Query(..., description="Longitude"),
     radius: float = Query(10.0, ge=1, le=100, description="Radius in kilometers"),
@@ -179,7 +324,7 @@ async def get_nearby_news(
     Example: GET /api/v1/news/nearby?lat=37.7749&lon=-122.4194&radius=50&page=1
     """
     offset = (page - 1) * limit
-    articles = await container.news_service.nearby_news(
+    articles, total = await container.news_service.nearby_news(
         lat=lat,
         lon=lon,
         radius=radius,
@@ -187,28 +332,34 @@ async def get_nearby_news(
         limit=limit,
         offset=offset
     )
-    return {
+    payload = {
         "articles": articles,
-        "total": len(articles),
+        "total": total,
         "page": page,
         "page_size": limit,
         "query_info": {"lat": lat, "lon": lon, "radius": radius, "category": category}
     }
+    return etag_response(request, payload)
 
-@router.get("", response_model=NewsResponse, dependencies=[Depends(get_current_user)])
+@router.get("", dependencies=[Depends(get_current_user)])
 async def get_news_unified(
+    request: Request,
     category: Optional[str] = Query(None, description="News category"),
     min_score: Optional[float] = Query(None, ge=0, le=1, description="Minimum relevance score"),
     source_name: Optional[str] = Query(None, description="News source name"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(5, ge=1, le=50, description="Items per page"),
+    after_date: Optional[datetime] = Query(None, description="Keyset cursor: publication_date of the last article on the previous page"),
+    after_id: Optional[UUID] = Query(None, description="Keyset cursor: id of the last article on the previous page"),
     container: Container = Depends(get_container)
 ):
     """
     Unified News Endpoint (Multiple Filters)
-    
-    Pagination: Use page and limit parameters
-    
+
+    Pagination: Use page and limit parameters, or pass after_date + after_id
+    (taken from the last article of the previous page) for cursor pagination
+    that stays fast on deep pages
+
     Authentication: Required
     
     Flow:
@@ -221,17 +372,26 @@ async def get_news_unified(
     
     Example: GET /api/v1/news?category=Technology&min_score=0.7&source_name=BBC&page=1
     """
+    after = (after_date, after_id) if after_date is not None and after_id is not None else None
+
+    cache_key = f"news:unified:{category}:{min_score}:{source_name}:{page}:{limit}:{after_date}:{after_id}"
+    cached = await _get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
     offset = (page - 1) * limit
-    articles = await container.news_service.fetch_news(
+    articles, total = await container.news_service.fetch_news(
         category=category,
         min_score=min_score,
         source_name=source_name,
         limit=limit,
-        offset=offset
+        offset=offset,
+        after=after,
+        summarize=False
     )
-    return {
+    payload = {
         "articles": articles,
-        "total": len(articles),
+        "total": total,
         "page": page,
         "page_size": limit,
         "query_info": {
@@ -240,3 +400,4 @@ async def get_news_unified(
             "source_name": source_name
         }
     }
+    return await summarized_response(request, container.news_service, articles, payload, cache_key)
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from app.models.schemas import NewsResponse
 from app.api.dependencies import get_current_user
 from app.core.container import get_container, Container
 
@@ -7,7 +6,7 @@ from app.core.container import get_container, Container
 # Note: These endpoints are under /news because they return news articles
 router = APIRouter(prefix="/news", tags=["Trending"])
 
-@router.get("/trending", response_model=NewsResponse, dependencies=[Depends(get_current_user)])
+@router.get("/trending", dependencies=[Depends(get_current_user)])
 async def get_trending_news(
     lat: float = Query(..., description="Latitude"),
     lon: float = Query(..., description="Longitude"),
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -5,14 +6,20 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     REDIS_URL: str
     GEMINI_API_KEY: str
-    
+
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
-    
+
     ENVIRONMENT: str = "development"
-    
+
+    # LLM backpressure: cap on in-flight Gemini calls and a per-minute
+    # request ceiling, so load spikes queue here instead of turning into
+    # provider-side errors and "Summary unavailable." responses
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_RPM: int = 300
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -21,4 +28,20 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     return Settings()
 
-settings = get_settings()
+# Frozen slotted mirror of the validated settings. Pydantic does the env
+# parsing and validation once; hot paths (JWT decode, pool setup) then read
+# plain C-level slots instead of going through BaseSettings machinery.
+@dataclass(frozen=True, slots=True)
+class RuntimeSettings:
+    DATABASE_URL: str
+    REDIS_URL: str
+    GEMINI_API_KEY: str
+    JWT_SECRET_KEY: str
+    JWT_ALGORITHM: str
+    ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int
+    ENVIRONMENT: str
+    LLM_MAX_CONCURRENCY: int
+    LLM_RPM: int
+
+settings = RuntimeSettings(**get_settings().model_dump())
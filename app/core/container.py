@@ -10,64 +10,36 @@ from app.services.trending_service import TrendingService
 from app.services.llm_service import LLMService
 
 class Container:
+    # Eagerly constructed singletons. get_container() is lru_cache'd so the
+    # lazy "is None" checks bought nothing and cost a dict lookup per access;
+    # slots make each access a single C-level attribute load.
+    __slots__ = (
+        'user_repository',
+        'article_repository',
+        'event_repository',
+        'llm_service',
+        'auth_service',
+        'news_service',
+        'trending_service',
+    )
+
     def __init__(self):
-        self._user_repository = None
-        self._article_repository = None
-        self._event_repository = None
-        self._auth_service = None
-        self._news_service = None
-        self._trending_service = None
-        self._llm_service = None
-    
-    @property
-    def user_repository(self) -> UserRepository:
-        if self._user_repository is None:
-            self._user_repository = UserRepository(db)
-        return self._user_repository
-    
-    @property
-    def article_repository(self) -> ArticleRepository:
-        if self._article_repository is None:
-            self._article_repository = ArticleRepository(db)
-        return self._article_repository
-    
-    @property
-    def event_repository(self) -> EventRepository:
-        if self._event_repository is None:
-            self._event_repository = EventRepository(db)
-        return self._event_repository
-    
-    @property
-    def llm_service(self) -> LLMService:
-        if self._llm_service is None:
-            self._llm_service = LLMService()
-        return self._llm_service
-    
-    @property
-    def auth_service(self) -> AuthService:
-        if self._auth_service is None:
-            self._auth_service = AuthService(self.user_repository)
-        return self._auth_service
-    
-    @property
-    def news_service(self) -> NewsService:
-        if self._news_service is None:
-            self._news_service = NewsService(
-                self.article_repository,
-                self.llm_service
-            )
-        return self._news_service
-    
-    @property
-    def trending_service(self) -> TrendingService:
-        if self._trending_service is None:
-            self._trending_service = TrendingService(
-                self.event_repository,
-                self.article_repository,
-                cache,
-                self.llm_service
-            )
-        return self._trending_service
+        self.user_repository = UserRepository(db)
+        self.article_repository = ArticleRepository(db)
+        self.event_repository = EventRepository(db)
+        self.llm_service = LLMService()
+        self.auth_service = AuthService(self.user_repository)
+        self.news_service = NewsService(
+            self.article_repository,
+            self.llm_service,
+            cache
+        )
+        self.trending_service = TrendingService(
+            self.event_repository,
+            self.article_repository,
+            cache,
+            self.llm_service
+        )
 
 @lru_cache()
 def get_container() -> Container:
@@ -4,16 +4,30 @@ from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.core.interfaces import IDatabase
 
+# Per-connection tuning shared by every asyncpg pool in the project (the
+# app pool below and scripts/ingest_data.py). statement_cache_size must
+# stay large enough to hold every distinct query text; the repositories
+# keep statement shapes stable by binding all inputs as parameters, so
+# the cache never thrashes on per-request SQL strings.
+POOL_SETTINGS = dict(
+    max_inactive_connection_lifetime=300,
+    command_timeout=60,
+    statement_cache_size=1024,
+)
+
 class Database(IDatabase):
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
-    
+
     async def connect(self):
+        # min_size keeps warm connections ready so bursts don't pay
+        # TCP/TLS setup; idle connections above it are recycled after 5
+        # minutes instead of pinning Postgres backends forever
         self.pool = await asyncpg.create_pool(
             settings.DATABASE_URL,
-            min_size=5,
-            max_size=20,
-            command_timeout=60
+            min_size=10,
+            max_size=50,
+            **POOL_SETTINGS
         )
     
     async def disconnect(self):
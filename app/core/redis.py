@@ -1,5 +1,5 @@
 import redis.asyncio as redis
-from typing import Optional
+from typing import Dict, List, Optional
 from app.core.config import settings
 
 class RedisCache:
@@ -22,8 +22,23 @@ class RedisCache:
     
     async def set(self, key: str, value: str, ex: int = 300):
         return await self.client.set(key, value, ex=ex)
+
+    async def set_nx(self, key: str, value: str, ex: int = 300) -> bool:
+        # SET NX with expiry: returns True only for the caller that created
+        # the key, which makes it usable as a single-flight lock
+        return bool(await self.client.set(key, value, ex=ex, nx=True))
     
     async def delete(self, key: str):
         return await self.client.delete(key)
 
+    async def mget(self, keys: List[str]):
+        return await self.client.mget(keys)
+
+    async def mset_ex(self, mapping: Dict[str, str], ex: int = 300):
+        # MSET has no TTL form, so pipeline per-key SETs into one round-trip
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, value, ex=ex)
+        return await pipe.execute()
+
 cache = RedisCache()
@@ -0,0 +1,32 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+class TTLCache:
+    """Small in-process cache with per-entry TTL and LRU eviction."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        self._entries.pop(key, None)
@@ -1,9 +1,13 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import anyio
+import asyncio
 import logging
+from app.core.config import settings
+from app.core.container import get_container
 from app.core.database import db
 from app.core.redis import cache
 from app.api.routes import auth, news, trending
@@ -14,6 +18,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+TRENDING_REFRESH_INTERVAL = 300  # seconds between materialized view refreshes
+
+async def _refresh_trending_view_loop():
+    """Periodically refresh trending_articles_mv so the no-radius trending
+    path keeps serving precomputed scores instead of re-aggregating events."""
+    event_repository = get_container().event_repository
+    while True:
+        await asyncio.sleep(TRENDING_REFRESH_INTERVAL)
+        try:
+            await event_repository.refresh_trending_view()
+            logger.info("Refreshed trending materialized view")
+        except Exception as e:
+            logger.warning(f"Trending view refresh failed: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -30,11 +48,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to connect to database or Redis: {e}")
         raise
-    
+
+    # The default anyio thread pool has 40 slots, which becomes an app-wide
+    # ceiling for anything offloaded via asyncio.to_thread (password hashing
+    # and similar blocking work). Raise it before traffic arrives.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 200
+
+    refresh_task = asyncio.create_task(_refresh_trending_view_loop())
+
     # Application is running - yield control back to FastAPI
     yield
-    
+
     # SHUTDOWN: Close database and Redis connections gracefully
+    refresh_task.cancel()
     try:
         await db.disconnect()
         await cache.disconnect()
@@ -42,12 +68,20 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
 
+# Interactive docs only outside production: OpenAPI schema generation walks
+# every Pydantic model on first hit and is wasted memory on prod workers
+_docs_enabled = settings.ENVIRONMENT != "production"
+
 # Create FastAPI application instance
 app = FastAPI(
     title="News Data Service API",
     description="Contextual news retrieval system with LLM-powered insights",
     version="1.0.0",
-    lifespan=lifespan  # Attach lifespan manager for startup/shutdown
+    lifespan=lifespan,  # Attach lifespan manager for startup/shutdown
+    default_response_class=ORJSONResponse,  # orjson serializes article payloads much faster than stdlib json
+    docs_url="/docs" if _docs_enabled else None,
+    redoc_url="/redoc" if _docs_enabled else None,
+    openapi_url="/openapi.json" if _docs_enabled else None
 )
 
 # Add CORS middleware to allow cross-origin requests
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+@dataclass(slots=True)
+class ArticleRecord:
+    """
+    Slotted article row as returned by ArticleRepository.
+
+    Services attach the LLM summary by assigning the ``llm_summary`` slot
+    directly, which is cheaper per row than mutating a dict and keeps the
+    per-article allocation to one fixed-layout object. orjson serializes
+    dataclasses natively, so these flow straight into cached payloads and
+    API responses. Distinct from the Pydantic ``Article`` schema in
+    ``schemas.py``, which documents the response shape.
+    """
+    id: UUID
+    title: str
+    description: Optional[str]
+    url: Optional[str]
+    publication_date: Optional[datetime]
+    source_name: Optional[str]
+    category: Optional[List[str]]
+    relevance_score: Optional[float]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    llm_summary: str = ""
@@ -1,8 +1,9 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import asyncpg
 import logging
 from fastapi import HTTPException, status
 from app.core.interfaces import IDatabase
+from app.models.article import ArticleRecord
 from app.repositories.interfaces import IArticleRepository
 
 logger = logging.getLogger(__name__)
@@ -10,94 +11,247 @@ logger = logging.getLogger(__name__)
 class ArticleRepository(IArticleRepository):
     def __init__(self, db: IDatabase):
         self._db = db
-    
-    async def find_by_filters(
-        self,
+
+    @staticmethod
+    def _build_where(
         category: Optional[str] = None,
         min_score: Optional[float] = None,
         source_name: Optional[str] = None,
         search_query: Optional[str] = None,
         lat: Optional[float] = None,
         lon: Optional[float] = None,
-        radius: Optional[float] = None,
-        limit: int = 5,
-        offset: int = 0,
-        order_by: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+        radius: Optional[float] = None
+    ) -> Tuple[str, str, str, List[Any], Dict[str, int]]:
+        """
+        Build the shared CTE/FROM/WHERE fragments and parameter list for
+        article filters.
+
+        When a search query is present the tsquery is compiled once in a CTE
+        and cross-joined, so the WHERE predicate and the ts_rank ORDER BY
+        both reference q.tsq instead of re-running plainto_tsquery. Also
+        returns the bind-parameter index of each filter value so ORDER BY
+        expressions can reference the same $n placeholder instead of
+        interpolating user input into the SQL text.
+        """
+        cte = ""
+        from_clause = "articles"
         conditions = []
         params = []
+        param_idx = {}
         param_count = 1
-        
+
         if category:
             conditions.append(f"${param_count} = ANY(category)")
             params.append(category)
+            param_idx['category'] = param_count
             param_count += 1
-        
+
         if min_score is not None:
             conditions.append(f"relevance_score >= ${param_count}")
             params.append(min_score)
+            param_idx['min_score'] = param_count
             param_count += 1
-        
+
         if source_name:
-            conditions.append(f"source_name ILIKE ${param_count}")
+            # lower() + LIKE instead of ILIKE so the pg_trgm index on
+            # lower(source_name) handles the leading-wildcard match
+            conditions.append(f"lower(source_name) LIKE lower(${param_count})")
             params.append(f"%{source_name}%")
+            param_idx['source_name'] = param_count
             param_count += 1
-        
+
         if search_query:
-            conditions.append(f"search_vector @@ plainto_tsquery('english', ${param_count})")
+            cte = f"WITH q AS (SELECT plainto_tsquery('english', ${param_count}) AS tsq) "
+            from_clause = "articles, q"
+            conditions.append("search_vector @@ q.tsq")
             params.append(search_query)
+            param_idx['search_query'] = param_count
             param_count += 1
-        
+
         if lat is not None and lon is not None and radius:
             conditions.append(
                 f"ST_DWithin(location, ST_SetSRID(ST_MakePoint(${param_count}, ${param_count + 1}), 4326)::geography, ${param_count + 2})"
             )
             params.extend([lon, lat, radius * 1000])
+            param_idx['lon'] = param_count
+            param_idx['lat'] = param_count + 1
             param_count += 3
-        
+
         where_clause = " AND ".join(conditions) if conditions else "TRUE"
-        
-        # Default ordering if not specified
+        return cte, from_clause, where_clause, params, param_idx
+
+    async def find_by_filters(
+        self,
+        category: Optional[str] = None,
+        min_score: Optional[float] = None,
+        source_name: Optional[str] = None,
+        search_query: Optional[str] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        radius: Optional[float] = None,
+        limit: int = 5,
+        offset: int = 0,
+        order_by: Optional[str] = None
+    ) -> List[ArticleRecord]:
+        articles, _ = await self.find_by_filters_with_total(
+            category=category,
+            min_score=min_score,
+            source_name=source_name,
+            search_query=search_query,
+            lat=lat,
+            lon=lon,
+            radius=radius,
+            limit=limit,
+            offset=offset,
+            order_by=order_by
+        )
+        return articles
+
+    async def find_by_filters_with_total(
+        self,
+        category: Optional[str] = None,
+        min_score: Optional[float] = None,
+        source_name: Optional[str] = None,
+        search_query: Optional[str] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        radius: Optional[float] = None,
+        limit: int = 5,
+        offset: int = 0,
+        order_by: Optional[str] = None,
+        after: Optional[Tuple[Any, Any]] = None
+    ) -> Tuple[List[ArticleRecord], int]:
+        """
+        Fetch one page of articles plus the total match count in one query.
+
+        COUNT(*) OVER() evaluates the WHERE clause once for both the page and
+        the total, instead of the separate count query the paginated
+        endpoints used to need.
+
+        ``order_by`` is a tag ('search', 'nearby', 'score', 'recent'), not a
+        SQL fragment: each tag maps to a fixed sort expression whose inputs
+        are already bound as $n parameters, so only a handful of statement
+        shapes ever exist and asyncpg's prepared-statement cache can serve
+        them. When omitted, the tag is inferred from the active filters.
+
+        ``after`` is a (publication_date, id) keyset cursor: when present the
+        page starts strictly after that row under publication_date DESC,
+        id DESC ordering, so deep pages cost O(limit) instead of the
+        O(offset) scan-and-discard that OFFSET pays.
+        """
+        cte, from_clause, where_clause, params, param_idx = self._build_where(
+            category=category,
+            min_score=min_score,
+            source_name=source_name,
+            search_query=search_query,
+            lat=lat,
+            lon=lon,
+            radius=radius
+        )
+
+        if after is not None:
+            after_date, after_id = after
+            keyset_cond = f"(publication_date, id) < (${len(params) + 1}, ${len(params) + 2})"
+            params.extend([after_date, after_id])
+            where_clause = f"{where_clause} AND {keyset_cond}"
+            offset = 0
+
+        # Infer the ordering tag from the active filters when not given
         if not order_by:
             if search_query:
-                # Search: rank by text matching score
-                order_by = f"ts_rank(search_vector, plainto_tsquery('english', '{search_query}')) DESC"
+                order_by = 'search'
             elif lat is not None and lon is not None:
-                # Nearby: rank by distance (closest first)
-                order_by = f"ST_Distance(location, ST_SetSRID(ST_MakePoint({lon}, {lat}), 4326)::geography)"
+                order_by = 'nearby'
+            elif min_score is not None:
+                order_by = 'score'
             else:
-                # Default: rank by publication date (most recent first)
-                order_by = "publication_date DESC NULLS LAST"
-        
+                order_by = 'recent'
+
+        # Map the tag to a fixed sort expression. Inputs reuse the $n
+        # placeholders already bound for the WHERE clause, so caller input
+        # never reaches the SQL text and statement shapes stay stable.
+        rank_col = ""
+        if after is not None:
+            # Cursor ordering must match the keyset comparison exactly and
+            # the idx_articles_pub_date_id definition (DESC NULLS LAST)
+            order_sql = "publication_date DESC NULLS LAST, id DESC"
+        elif order_by == 'search' and search_query:
+            # Search: select ts_rank once as a column and sort on the
+            # alias, so the score is computed a single time per row
+            rank_col = "ts_rank(search_vector, q.tsq) AS rank,"
+            order_sql = "rank DESC, relevance_score DESC"
+        elif order_by == 'nearby' and lat is not None and lon is not None:
+            # Nearby: rank by distance (closest first)
+            if 'lon' in param_idx:
+                lon_idx, lat_idx = param_idx['lon'], param_idx['lat']
+            else:
+                params.extend([lon, lat])
+                lon_idx, lat_idx = len(params) - 1, len(params)
+            order_sql = f"ST_Distance(location, ST_SetSRID(ST_MakePoint(${lon_idx}, ${lat_idx}), 4326)::geography)"
+        elif order_by == 'score':
+            # Score filter: rank by relevance score (highest first)
+            order_sql = "relevance_score DESC"
+        else:
+            # Default: rank by publication date (most recent first). Keep
+            # NULLS LAST in sync with idx_articles_pub_date_id so the sort
+            # is an index scan, not an explicit sort of the filtered set.
+            order_sql = "publication_date DESC NULLS LAST"
+
+        param_count = len(params) + 1
+
         query = f"""
-            SELECT 
-                title, description, url, publication_date,
+            {cte}SELECT
+                {rank_col}
+                id, title, description, url, publication_date,
                 source_name, category, relevance_score,
                 ST_Y(location::geometry) as latitude,
-                ST_X(location::geometry) as longitude
-            FROM articles
+                ST_X(location::geometry) as longitude,
+                COUNT(*) OVER() AS total_count
+            FROM {from_clause}
             WHERE {where_clause}
-            ORDER BY {order_by}
-            LIMIT {limit}
-            OFFSET {offset}
+            ORDER BY {order_sql}
+            LIMIT ${param_count}
+            OFFSET ${param_count + 1}
         """
+        params.extend([limit, offset])
 
         try:
             rows = await self._db.fetch(query, *params)
-            return [dict(row) for row in rows]
+            if not rows:
+                return [], 0
+            total = rows[0]['total_count']
+            # Build slotted records instead of dicts: total_count and rank
+            # are simply not copied, and the llm_summary slot is mutated in
+            # place by the services without per-row dict overhead
+            articles = [
+                ArticleRecord(
+                    id=row['id'],
+                    title=row['title'],
+                    description=row['description'],
+                    url=row['url'],
+                    publication_date=row['publication_date'],
+                    source_name=row['source_name'],
+                    category=row['category'],
+                    relevance_score=row['relevance_score'],
+                    latitude=row['latitude'],
+                    longitude=row['longitude'],
+                )
+                for row in rows
+            ]
+            return articles, total
         except asyncpg.PostgresError as e:
-            logger.error(f"Database error in find_by_filters: {e}")
+            logger.error(f"Database error in find_by_filters_with_total: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database query failed"
             )
         except Exception as e:
-            logger.error(f"Unexpected error in find_by_filters: {e}")
+            logger.error(f"Unexpected error in find_by_filters_with_total: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to retrieve articles"
             )
-    
+
     async def count_by_filters(
         self,
         category: Optional[str] = None,
@@ -108,41 +262,18 @@ class ArticleRepository(IArticleRepository):
         lon: Optional[float] = None,
         radius: Optional[float] = None
     ) -> int:
-        conditions = []
-        params = []
-        param_count = 1
-        
-        if category:
-            conditions.append(f"${param_count} = ANY(category)")
-            params.append(category)
-            param_count += 1
-        
-        if min_score is not None:
-            conditions.append(f"relevance_score >= ${param_count}")
-            params.append(min_score)
-            param_count += 1
-        
-        if source_name:
-            conditions.append(f"source_name ILIKE ${param_count}")
-            params.append(f"%{source_name}%")
-            param_count += 1
-        
-        if search_query:
-            conditions.append(f"search_vector @@ plainto_tsquery('english', ${param_count})")
-            params.append(search_query)
-            param_count += 1
-        
-        if lat is not None and lon is not None and radius:
-            conditions.append(
-                f"ST_DWithin(location, ST_SetSRID(ST_MakePoint(${param_count}, ${param_count + 1}), 4326)::geography, ${param_count + 2})"
-            )
-            params.extend([lon, lat, radius * 1000])
-            param_count += 3
-        
-        where_clause = " AND ".join(conditions) if conditions else "TRUE"
-        
-        query = f"SELECT COUNT(*) as count FROM articles WHERE {where_clause}"
-        
+        cte, from_clause, where_clause, params, _ = self._build_where(
+            category=category,
+            min_score=min_score,
+            source_name=source_name,
+            search_query=search_query,
+            lat=lat,
+            lon=lon,
+            radius=radius
+        )
+
+        query = f"{cte}SELECT COUNT(*) as count FROM {from_clause} WHERE {where_clause}"
+
         try:
             result = await self._db.fetchrow(query, *params)
             return result['count']
@@ -152,13 +283,18 @@ class ArticleRepository(IArticleRepository):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database query failed"
             )
-    
-    async def find_all(self) -> List[Dict[str, Any]]:
+
+    async def find_top_ids(self, limit: int) -> List[Any]:
         try:
-            rows = await self._db.fetch("SELECT id FROM articles")
-            return [dict(row) for row in rows]
+            # Id-only projection: callers sample articles, they never need
+            # hydrated rows. idx_articles_score makes this an index scan.
+            rows = await self._db.fetch(
+                "SELECT id FROM articles ORDER BY relevance_score DESC NULLS LAST LIMIT $1",
+                limit
+            )
+            return [row['id'] for row in rows]
         except asyncpg.PostgresError as e:
-            logger.error(f"Database error in find_all: {e}")
+            logger.error(f"Database error in find_top_ids: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database query failed"
@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Iterable, Optional, List, Dict, Any, Tuple
 from uuid import UUID
 import asyncpg
 import logging
@@ -9,9 +9,43 @@ from app.repositories.interfaces import IEventRepository
 logger = logging.getLogger(__name__)
 
 class EventRepository(IEventRepository):
+    # SQL hoisted to class constants so every call reuses byte-identical
+    # statement text and stays on the pool's server-side prepared plan
+    _INSERT_EVENT_GEO_SQL = """
+        INSERT INTO user_events (user_id, article_id, event_type, location)
+        VALUES ($1, $2, $3, ST_SetSRID(ST_MakePoint($4, $5), 4326)::geography)
+    """
+    _INSERT_EVENT_SQL = """
+        INSERT INTO user_events (user_id, article_id, event_type)
+        VALUES ($1, $2, $3)
+    """
+    _TRENDING_MV_SQL = """
+        SELECT
+            id, title, description, url, publication_date,
+            source_name, category, relevance_score,
+            latitude, longitude, trending_score
+        FROM trending_articles_mv
+        ORDER BY trending_score DESC
+        LIMIT $1
+    """
+    _TRENDING_MV_RADIUS_SQL = """
+        SELECT
+            id, title, description, url, publication_date,
+            source_name, category, relevance_score,
+            latitude, longitude, trending_score
+        FROM trending_articles_mv
+        WHERE ST_DWithin(
+            location,
+            ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography,
+            $3
+        )
+        ORDER BY trending_score DESC
+        LIMIT $4
+    """
+
     def __init__(self, db: IDatabase):
         self._db = db
-    
+
     async def create_event(
         self,
         user_id: UUID,
@@ -23,18 +57,12 @@ class EventRepository(IEventRepository):
         try:
             if lat is not None and lon is not None:
                 await self._db.execute(
-                    """
-                    INSERT INTO user_events (user_id, article_id, event_type, location)
-                    VALUES ($1, $2, $3, ST_SetSRID(ST_MakePoint($4, $5), 4326)::geography)
-                    """,
+                    self._INSERT_EVENT_GEO_SQL,
                     user_id, article_id, event_type, lon, lat
                 )
             else:
                 await self._db.execute(
-                    """
-                    INSERT INTO user_events (user_id, article_id, event_type)
-                    VALUES ($1, $2, $3)
-                    """,
+                    self._INSERT_EVENT_SQL,
                     user_id, article_id, event_type
                 )
         except asyncpg.ForeignKeyViolationError:
@@ -51,35 +79,52 @@ class EventRepository(IEventRepository):
             )
     
     async def create_events_batch(self, events: List[Dict[str, Any]]) -> None:
-        args = []
-        for event in events:
-            lat = event.get('lat')
-            lon = event.get('lon')
-            if lat is not None and lon is not None:
-                args.append((
-                    event['user_id'],
-                    event['article_id'],
-                    event['event_type'],
-                    lon,
-                    lat
-                ))
-        
-        if args:
-            try:
-                await self._db.executemany(
-                    """
-                    INSERT INTO user_events (user_id, article_id, event_type, user_lat, user_lon)
-                    VALUES ($1, $2, $3, $5, $4)
-                    """,
-                    args
-                )
-            except asyncpg.PostgresError as e:
-                logger.error(f"Database error in create_events_batch: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to create events batch"
+        # Events without coordinates are still valid engagement signals;
+        # NULL lat/lon simply leaves user_location unset (the insert trigger
+        # only builds the geography point when both are present)
+        await self.create_events_copy(
+            (
+                event['user_id'],
+                event['article_id'],
+                event['event_type'],
+                event.get('lat'),
+                event.get('lon')
+            )
+            for event in events
+        )
+
+    async def create_events_copy(self, records: Iterable[Tuple]) -> None:
+        """
+        COPY (user_id, article_id, event_type, lat, lon) tuples into
+        user_events. Bulk callers that already hold columnar data can feed
+        tuples straight in without building a dict per event.
+        """
+        records = list(records)
+        if not records:
+            return
+        try:
+            # COPY streams the whole batch over the binary protocol in a
+            # single transaction instead of one parse/bind/execute per row
+            async with self._db.transaction() as connection:
+                await connection.copy_records_to_table(
+                    'user_events',
+                    records=records,
+                    columns=['user_id', 'article_id', 'event_type', 'user_lat', 'user_lon']
                 )
+        except asyncpg.PostgresError as e:
+            logger.error(f"Database error in create_events_copy: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create events batch"
+            )
     
+    async def refresh_trending_view(self) -> None:
+        try:
+            await self._db.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY trending_articles_mv")
+        except asyncpg.PostgresError as e:
+            logger.error(f"Database error refreshing trending view: {e}")
+            raise
+
     async def get_trending_articles(
         self,
         lat: Optional[float] = None,
@@ -87,63 +132,20 @@ class EventRepository(IEventRepository):
         radius: Optional[float] = None,
         limit: int = 10
     ) -> List[Dict[str, Any]]:
-        location_filter = ""
-        params = []
-        
-        if lat is not None and lon is not None and radius:
-            location_filter = """
-                AND ST_DWithin(
-                    ue.user_location,
-                    ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography,
-                    $3
-                )
-            """
-            params = [lon, lat, radius * 1000]
-        
-        query = f"""
-            WITH event_stats AS (
-                SELECT 
-                    ue.article_id,
-                    COUNT(CASE WHEN ue.event_type = 'view' THEN 1 END) as views,
-                    COUNT(CASE WHEN ue.event_type = 'click' THEN 1 END) as clicks,
-                    COUNT(CASE WHEN ue.event_type = 'share' THEN 1 END) as shares,
-                    MAX(ue.created_at) as latest_event,
-                    AVG(
-                        CASE 
-                            WHEN {'' if not params else f'ST_Distance(ue.user_location, ST_SetSRID(ST_MakePoint({lon}, {lat}), 4326)::geography) > 0 THEN'}
-                            {'' if not params else f'1.0 / (1.0 + ST_Distance(ue.user_location, ST_SetSRID(ST_MakePoint({lon}, {lat}), 4326)::geography) / 1000.0)'}
-                            {'1.0' if not params else 'ELSE 1.0'}
-                            END
-                    ) as avg_proximity
-                FROM user_events ue
-                WHERE ue.created_at > NOW() - INTERVAL '48 hours'
-                {location_filter}
-                GROUP BY ue.article_id
-            ),
-            trending_scores AS (
-                SELECT 
-                    es.article_id,
-                    (
-                        (es.views * 1.0 + es.clicks * 3.0 + es.shares * 5.0) *
-                        (1.0 / (1.0 + EXTRACT(EPOCH FROM (NOW() - es.latest_event)) / 3600.0)) *
-                        COALESCE(es.avg_proximity, 1.0)
-                    ) as trending_score
-                FROM event_stats es
-            )
-            SELECT 
-                a.title, a.description, a.url, a.publication_date,
-                a.source_name, a.category, a.relevance_score,
-                ST_Y(a.location::geometry) as latitude,
-                ST_X(a.location::geometry) as longitude,
-                ts.trending_score
-            FROM articles a
-            JOIN trending_scores ts ON a.id = ts.article_id
-            ORDER BY ts.trending_score DESC
-            LIMIT {limit}
-        """
-        
+        # Both paths read the precomputed view the refresh loop maintains;
+        # nothing re-aggregates raw user_events at request time. With a
+        # radius, "trending near me" filters the view by article location
+        # (ST_DWithin over idx_trending_mv_location) — a coarser signal
+        # than the old per-event proximity weighting, but it keeps the
+        # request-time cost at a small indexed scan of the view.
         try:
-            rows = await self._db.fetch(query, *params)
+            if lat is not None and lon is not None and radius:
+                rows = await self._db.fetch(
+                    self._TRENDING_MV_RADIUS_SQL,
+                    lon, lat, radius * 1000, limit
+                )
+            else:
+                rows = await self._db.fetch(self._TRENDING_MV_SQL, limit)
             return [dict(row) for row in rows]
         except asyncpg.PostgresError as e:
             logger.error(f"Database error in get_trending_articles: {e}")
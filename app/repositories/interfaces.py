@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from typing import Iterable, Optional, List, Dict, Any, Tuple
 from uuid import UUID
+from app.models.article import ArticleRecord
 
 class IUserRepository(ABC):
     @abstractmethod
@@ -14,10 +15,6 @@ class IUserRepository(ABC):
     @abstractmethod
     async def find_by_id(self, user_id: UUID) -> Optional[Dict[str, Any]]:
         pass
-    
-    @abstractmethod
-    async def exists_by_email_or_username(self, email: str, username: str) -> bool:
-        pass
 
 class IArticleRepository(ABC):
     @abstractmethod
@@ -32,9 +29,26 @@ class IArticleRepository(ABC):
         radius: Optional[float] = None,
         limit: int = 5,
         order_by: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[ArticleRecord]:
         pass
     
+    @abstractmethod
+    async def find_by_filters_with_total(
+        self,
+        category: Optional[str] = None,
+        min_score: Optional[float] = None,
+        source_name: Optional[str] = None,
+        search_query: Optional[str] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        radius: Optional[float] = None,
+        limit: int = 5,
+        offset: int = 0,
+        order_by: Optional[str] = None,
+        after: Optional[Tuple[Any, Any]] = None
+    ) -> Tuple[List[ArticleRecord], int]:
+        pass
+
     @abstractmethod
     async def count_by_filters(
         self,
@@ -49,7 +63,7 @@ class IArticleRepository(ABC):
         pass
     
     @abstractmethod
-    async def find_all(self) -> List[Dict[str, Any]]:
+    async def find_top_ids(self, limit: int) -> List[Any]:
         pass
 
 class IEventRepository(ABC):
@@ -67,7 +81,15 @@ class IEventRepository(ABC):
     @abstractmethod
     async def create_events_batch(self, events: List[Dict[str, Any]]) -> None:
         pass
+
+    @abstractmethod
+    async def create_events_copy(self, records: Iterable[Tuple]) -> None:
+        pass
     
+    @abstractmethod
+    async def refresh_trending_view(self) -> None:
+        pass
+
     @abstractmethod
     async def get_trending_articles(
         self,
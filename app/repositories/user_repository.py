@@ -63,17 +63,3 @@ class UserRepository(IUserRepository):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to retrieve user"
             )
-    
-    async def exists_by_email_or_username(self, email: str, username: str) -> bool:
-        try:
-            result = await self._db.fetchrow(
-                "SELECT id FROM users WHERE email = $1 OR username = $2",
-                email, username
-            )
-            return result is not None
-        except asyncpg.PostgresError as e:
-            logger.error(f"Database error in exists_by_email_or_username: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to check user existence"
-            )
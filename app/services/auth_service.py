@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import timedelta
+import asyncio
 import logging
 from fastapi import HTTPException, status
 from app.repositories.interfaces import IUserRepository
@@ -10,6 +11,7 @@ from app.core.security import (
     create_refresh_token,
     decode_refresh_token
 )
+from app.core.ttl_cache import TTLCache
 from app.models.schemas import UserSignup, UserLogin
 
 logger = logging.getLogger(__name__)
@@ -17,24 +19,28 @@ logger = logging.getLogger(__name__)
 class AuthService:
     def __init__(self, user_repository: IUserRepository):
         self._user_repo = user_repository
+        # Authenticated requests resolve the same user row over and over;
+        # a short TTL keeps deactivations visible within a minute while
+        # shedding one users-table round-trip per request
+        self._user_cache = TTLCache(maxsize=50000, ttl=60)
     
     async def signup(self, user_data: UserSignup) -> dict:
-        if await self._user_repo.exists_by_email_or_username(user_data.email, user_data.username):
-            logger.warning(f"Signup attempt with existing email/username: {user_data.email}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email or username already registered"
-            )
-        
-        hashed_password = get_password_hash(user_data.password)
+        # No existence pre-check: the unique constraints on email/username
+        # already reject duplicates atomically in create(), so the extra
+        # round-trip only added a TOCTOU race window
+        # Password hashing is deliberately slow CPU work; run it in a worker
+        # thread so it doesn't stall the event loop for other requests
+        hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
         user = await self._user_repo.create(user_data.email, user_data.username, hashed_password)
         logger.info(f"New user created: {user['email']}")
         return user
     
     async def login(self, login_data: UserLogin) -> dict:
         user = await self._user_repo.find_by_email(login_data.email)
-        
-        if not user or not verify_password(login_data.password, user['hashed_password']):
+
+        if not user or not await asyncio.to_thread(
+            verify_password, login_data.password, user['hashed_password']
+        ):
             logger.warning(f"Failed login attempt for email: {login_data.email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -106,4 +112,15 @@ class AuthService:
         return {"access_token": new_access_token, "token_type": "bearer"}
     
     async def get_current_user(self, user_id: str) -> Optional[dict]:
-        return await self._user_repo.find_by_id(user_id)
+        user = self._user_cache.get(user_id)
+        if user is not None:
+            return user
+
+        user = await self._user_repo.find_by_id(user_id)
+        if user and user.get('is_active'):
+            self._user_cache.set(user_id, user)
+        return user
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop a cached user row, e.g. after deactivation."""
+        self._user_cache.delete(user_id)
@@ -1,22 +1,33 @@
+import hashlib
 import json
+import orjson
 import logging
 import asyncio
 import google.generativeai as genai
-from typing import List, Dict
+from aiolimiter import AsyncLimiter
+from typing import Any, List, Dict, Optional
 from app.core.config import settings
+from app.core.redis import cache
+from app.core.ttl_cache import TTLCache
 
 genai.configure(api_key=settings.GEMINI_API_KEY)
 logger = logging.getLogger(__name__)
 
-class LLMService:
-    def __init__(self):
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
-    
-    async def extract_entities(self, query: str) -> Dict:
-        prompt = f"""
+# Exact-match entity cache in front of Redis: repeated searches for the same
+# normalized query return the parsed dict without even a Redis round-trip
+_entities_local_cache = TTLCache(maxsize=10000, ttl=3600)
+
+# Coalescing window for cross-request summary batching: wait this long (or
+# until the batch is full) for other in-flight requests to contribute
+# articles before issuing one combined LLM call
+_SUMMARY_BATCH_WINDOW = 0.02
+_SUMMARY_BATCH_MAX = 32
+
+# Static prompt body hoisted to module scope; only the query slot varies
+_ENTITY_PROMPT = """
 Extract information from this news query and return ONLY valid JSON without any markdown formatting:
 
-Query: "{query}"
+Query: "{q}"
 
 Return a JSON object with these fields:
 - entities: list of named entities (people, organizations, locations, events)
@@ -27,20 +38,71 @@ Return a JSON object with these fields:
 Example output:
 {{"entities": ["Elon Musk", "Twitter"], "intent": "search", "search_terms": ["Elon Musk", "Twitter", "acquisition"], "location_hint": "Palo Alto"}}
 """
-        
+
+class LLMService:
+    def __init__(self):
+        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        # JSON response mode for the structured calls: the model emits bare
+        # JSON, so no markdown-fence stripping and far fewer parse failures
+        self.json_model = genai.GenerativeModel(
+            'gemini-2.5-flash',
+            generation_config={'response_mime_type': 'application/json'}
+        )
+        # Backpressure for every Gemini call: a semaphore caps in-flight
+        # requests and a token bucket enforces the per-minute ceiling, so
+        # load spikes queue here instead of becoming provider errors
+        self._llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        self._llm_rate = AsyncLimiter(settings.LLM_RPM, 60)
+        # Cross-request coalescer state; the worker task is started lazily
+        # on first use so the module singleton needs no running loop.
+        # Dispatched batch tasks are held here so they aren't GC'd mid-run.
+        self._summary_queue: asyncio.Queue = asyncio.Queue()
+        self._summary_worker: Optional[asyncio.Task] = None
+        self._summary_batches: set = set()
+    
+    async def _llm_call(self, model, prompt: str):
+        # Single choke point for all Gemini traffic; callers never talk to
+        # the model object directly
+        async with self._llm_rate, self._llm_semaphore:
+            return await model.generate_content_async(prompt)
+
+    @staticmethod
+    def _entities_cache_key(query: str) -> str:
+        normalized = " ".join(query.lower().split())
+        return "entities:" + hashlib.sha1(normalized.encode()).hexdigest()
+
+    async def extract_entities(self, query: str) -> Dict:
+        # Popular search queries repeat constantly; the parsed entity dict is
+        # stable for a given query, so an hour in Redis skips the Gemini
+        # round-trip entirely on repeats
+        cache_key = self._entities_cache_key(query)
+
+        local_hit = _entities_local_cache.get(cache_key)
+        if local_hit is not None:
+            return local_hit
+
+        try:
+            cached_data = await cache.get(cache_key)
+            if cached_data:
+                logger.info(f"Cache hit for entity extraction: {cache_key}")
+                result = orjson.loads(cached_data)
+                _entities_local_cache.set(cache_key, result)
+                return result
+        except Exception as e:
+            logger.warning(f"Redis cache read failed for entities: {e}")
+
+        prompt = _ENTITY_PROMPT.format(q=query)
+
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text.strip()
-            
-            if text.startswith('```json'):
-                text = text[7:]
-            if text.startswith('```'):
-                text = text[3:]
-            if text.endswith('```'):
-                text = text[:-3]
-            text = text.strip()
-            
-            result = json.loads(text)
+            response = await self._llm_call(self.json_model, prompt)
+            result = orjson.loads(response.text)
+
+            _entities_local_cache.set(cache_key, result)
+            try:
+                await cache.set(cache_key, orjson.dumps(result).decode(), ex=3600)
+            except Exception as e:
+                logger.warning(f"Redis cache write failed for entities: {e}")
+
             return result
         except genai.types.BlockedPromptException as e:
             logger.warning(f"LLM blocked prompt for entity extraction: {e}")
@@ -58,7 +120,7 @@ Example output:
                 "search_terms": query.split(),
                 "location_hint": None
             }
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, orjson.JSONDecodeError) as e:
             logger.error(f"Failed to parse LLM JSON response: {e}")
             return {
                 "entities": [],
@@ -75,7 +137,8 @@ Example output:
                 "location_hint": None
             }
     
-    async def generate_summary(self, article_text: str) -> str:
+    async def generate_summary(self, article_text: str) -> Optional[str]:
+        """Summarize one article; None signals failure to the caller."""
         prompt = f"""
 Summarize this news article in 2-3 concise sentences:
 
@@ -83,37 +146,215 @@ Summarize this news article in 2-3 concise sentences:
 
 Summary:
 """
-        
+
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._llm_call(self.model, prompt)
             return response.text.strip()
         except genai.types.BlockedPromptException as e:
             logger.warning(f"LLM blocked prompt for summary: {e}")
-            return "Summary unavailable."
+            return None
         except genai.types.StopCandidateException as e:
             logger.warning(f"LLM stopped generation for summary: {e}")
-            return "Summary unavailable."
+            return None
         except Exception as e:
             logger.error(f"LLM error in generate_summary: {e}")
-            return "Summary unavailable."
-    
-    async def generate_summaries_batch(self, articles: List[Dict]) -> List[str]:
-        tasks = []
+            return None
+
+    @staticmethod
+    def _article_field(article: Any, name: str, default: Any = None) -> Any:
+        # News paths pass slotted ArticleRecord instances; trending still
+        # passes dict rows from the materialized view, so read both shapes
+        if isinstance(article, dict):
+            return article.get(name, default)
+        return getattr(article, name, default)
+
+    @classmethod
+    def _summary_coalesce_key(cls, article: Any) -> str:
+        article_id = cls._article_field(article, 'id')
+        if article_id is not None:
+            return str(article_id)
+        return f"{cls._article_field(article, 'title', '')}|{cls._article_field(article, 'description', '')}"
+
+    @classmethod
+    def _summary_cache_key(cls, article: Any) -> str:
+        # Content hash in the key means an edited title/description misses
+        # the cache automatically instead of serving a stale summary
+        content = f"{cls._article_field(article, 'title', '')}|{cls._article_field(article, 'description', '')}"
+        digest = hashlib.sha1(content.encode()).hexdigest()[:8]
+        return f"llm_sum:{cls._article_field(article, 'id', '_')}:{digest}"
+
+    async def summarize_one(self, article: Any) -> Optional[str]:
+        """
+        Enqueue one article for summarization and await its result.
+
+        Articles from all concurrent requests are coalesced into a single
+        batched LLM call (deduplicated by article id), so N simultaneous
+        small pages cost one round-trip instead of N tiny batches. Returns
+        None when that article's summary failed, so callers can fall back
+        for just the failed subset instead of discarding the whole page.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._summary_queue.put((self._summary_coalesce_key(article), article, future))
+        if self._summary_worker is None or self._summary_worker.done():
+            self._summary_worker = asyncio.create_task(self._drain_summary_queue())
+        return await future
+
+    async def _drain_summary_queue(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            key, article, future = await self._summary_queue.get()
+            # pending: coalesce key -> (article, futures awaiting its summary)
+            pending = {key: (article, [future])}
+
+            deadline = loop.time() + _SUMMARY_BATCH_WINDOW
+            while len(pending) < _SUMMARY_BATCH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    key, article, future = await asyncio.wait_for(
+                        self._summary_queue.get(), timeout=remaining
+                    )
+                except asyncio.TimeoutError:
+                    break
+                if key in pending:
+                    pending[key][1].append(future)
+                else:
+                    pending[key] = (article, [future])
+
+            # Resolve each batch in its own task so the drain loop goes
+            # straight back to collecting: batches run concurrently (the
+            # shared semaphore still bounds LLM calls) and a fully cached
+            # batch isn't stuck behind someone else's Gemini round-trip
+            task = asyncio.create_task(self._resolve_batch(pending))
+            self._summary_batches.add(task)
+            task.add_done_callback(self._summary_batches.discard)
+
+    async def _resolve_batch(self, pending: Dict) -> None:
+        batch = [entry[0] for entry in pending.values()]
+        try:
+            summaries = await self._summaries_through_cache(batch)
+        except Exception as e:
+            # Never leave waiters hanging: an unexpected error here marks
+            # every article in the batch as failed instead of stranding
+            # callers awaiting their futures forever
+            logger.error(f"Summary batch resolution failed: {e}")
+            summaries = [None] * len(batch)
+
+        for (_, futures), summary in zip(pending.values(), summaries):
+            for waiter in futures:
+                if not waiter.done():
+                    waiter.set_result(summary)
+
+    async def _summaries_through_cache(self, batch: List[Any]) -> List[Optional[str]]:
+        """
+        Resolve summaries for a batch, serving from Redis where possible.
+
+        One MGET covers the whole batch; only the misses go to the LLM, and
+        their results are written back with a day-long TTL so the same
+        article returned across pages and filters is summarized once.
+        """
+        cache_keys = [self._summary_cache_key(article) for article in batch]
+        cached: List[Optional[str]] = [None] * len(batch)
+        try:
+            cached = await cache.mget(cache_keys)
+        except Exception as e:
+            logger.warning(f"Redis summary cache read failed: {e}")
+
+        misses = [i for i, hit in enumerate(cached) if not hit]
+        if not misses:
+            return list(cached)
+
+        try:
+            generated = await self.generate_summaries_batch([batch[i] for i in misses])
+        except Exception as e:
+            logger.error(f"Coalesced summary batch failed: {e}")
+            generated = [None] * len(misses)
+
+        summaries: List[Optional[str]] = list(cached)
+        to_cache = {}
+        for i, summary in zip(misses, generated):
+            summaries[i] = summary
+            # Never cache failures: the next request should retry, not be
+            # served a day-old "unavailable"
+            if summary is not None:
+                to_cache[cache_keys[i]] = summary
+
+        if to_cache:
+            try:
+                await cache.mset_ex(to_cache, ex=86400)
+            except Exception as e:
+                logger.warning(f"Redis summary cache write failed: {e}")
+
+        return summaries
+
+    async def generate_summaries_batch(self, articles: List[Any]) -> List[Optional[str]]:
+        """
+        Summarize a batch of articles in one LLM round-trip.
+
+        Returns one entry per article in order; None marks an article whose
+        summary could not be produced. A partial batched response only
+        costs the missing tail, and in the per-article fallback one bad
+        call no longer discards its siblings' good answers.
+        """
+        texts = []
         for article in articles:
-            text = f"{article.get('title', '')} {article.get('description', '')}"
-            text = text[:2000]
-            tasks.append(self.generate_summary(text))
-        
-        summaries = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        result = []
+            text = (
+                f"{self._article_field(article, 'title', '')} "
+                f"{self._article_field(article, 'description', '')}"
+            )
+            texts.append(text[:2000])
+
+        if not texts:
+            return []
+        if len(texts) == 1:
+            return [await self.generate_summary(texts[0])]
+
+        # Summarize the whole page in one prompt: N articles cost one LLM
+        # round-trip instead of N. Falls back to per-article calls below if
+        # the batched response cannot be parsed.
+        numbered = "\n\n".join(f"{i + 1}) {text}" for i, text in enumerate(texts))
+        prompt = f"""
+Summarize each of the following {len(texts)} news articles in 2-3 concise sentences.
+Return ONLY a valid JSON array of {len(texts)} strings, one summary per article, in the same order, without any markdown formatting:
+
+{numbered}
+"""
+
+        try:
+            response = await self._llm_call(self.json_model, prompt)
+            summaries = orjson.loads(response.text)
+            if isinstance(summaries, list):
+                # A short or long array still lines up positionally for the
+                # entries we did get; pad the rest rather than paying N extra
+                # per-article calls for a truncated response
+                if len(summaries) != len(texts):
+                    logger.warning(
+                        f"Batched summary response had {len(summaries)} entries "
+                        f"for {len(texts)} articles, padding the remainder"
+                    )
+                result: List[Optional[str]] = [str(summary).strip() for summary in summaries[:len(texts)]]
+                result.extend(None for _ in range(len(texts) - len(result)))
+                return result
+            logger.warning("Batched summary response was not a JSON array, falling back to per-article calls")
+        except (json.JSONDecodeError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Failed to parse batched summary response, falling back: {e}")
+        except Exception as e:
+            logger.warning(f"Batched summary call failed, falling back: {e}")
+
+        summaries = await asyncio.gather(
+            *(self.generate_summary(text) for text in texts),
+            return_exceptions=True
+        )
+
+        per_article: List[Optional[str]] = []
         for summary in summaries:
             if isinstance(summary, Exception):
                 logger.error(f"LLM summary failed in batch: {summary}")
-                result.append("Summary unavailable.")
+                per_article.append(None)
             else:
-                result.append(summary)
-        
-        return result
+                per_article.append(summary)
+
+        return per_article
 
 llm_service = LLMService()
@@ -1,15 +1,25 @@
 from typing import Optional, List
+import asyncio
 import logging
+import geohash2
+import orjson
 from fastapi import HTTPException, status
 from app.repositories.interfaces import IArticleRepository
+from app.core.redis import RedisCache
 from app.services.llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
 class NewsService:
-    def __init__(self, article_repository: IArticleRepository, llm_service: LLMService):
+    def __init__(
+        self,
+        article_repository: IArticleRepository,
+        llm_service: LLMService,
+        cache: RedisCache
+    ):
         self._article_repo = article_repository
         self._llm_service = llm_service
+        self._cache = cache
     
     async def fetch_news(
         self,
@@ -21,24 +31,21 @@ class NewsService:
         lon: Optional[float] = None,
         radius: Optional[float] = None,
         limit: int = 5,
-        offset: int = 0
+        offset: int = 0,
+        after=None,
+        summarize: bool = True
     ):
-        order_by = None
-        if search_query:
-            # For search: rank by text matching score (ts_rank) + relevance_score
-            order_by = f"ts_rank(search_vector, plainto_tsquery('english', '{search_query}')) DESC, relevance_score DESC"
-        elif min_score is not None:
-            # For score filter: rank by relevance_score (highest first)
-            order_by = "relevance_score DESC"
-        elif lat is not None and lon is not None:
-            # For nearby: rank by distance (closest first)
-            order_by = f"ST_Distance(location, ST_SetSRID(ST_MakePoint({lon}, {lat}), 4326)::geography)"
-        elif category is not None or source_name is not None:
-            # For category and source: rank by publication_date (most recent first)
-            order_by = "publication_date DESC NULLS LAST"
-        
+        """
+        Fetch one filtered page. With ``summarize=False`` the articles come
+        back without LLM summaries, so routes can answer a conditional
+        request from the row identities alone and call attach_summaries
+        only when the client actually needs the body.
+        """
         try:
-            articles = await self._article_repo.find_by_filters(
+            # Ordering is chosen by the repository, which binds the search
+            # terms and coordinates as parameters instead of interpolating
+            # them into the ORDER BY string
+            articles, total = await self._article_repo.find_by_filters_with_total(
                 category=category,
                 min_score=min_score,
                 source_name=source_name,
@@ -48,20 +55,13 @@ class NewsService:
                 radius=radius,
                 limit=limit,
                 offset=offset,
-                order_by=order_by
+                after=after
             )
-            
-            if articles:
-                try:
-                    summaries = await self._llm_service.generate_summaries_batch(articles)
-                    for article, summary in zip(articles, summaries):
-                        article['llm_summary'] = summary
-                except Exception as e:
-                    logger.warning(f"LLM summary generation failed: {e}")
-                    for article in articles:
-                        article['llm_summary'] = "Summary unavailable."
-            
-            return articles
+
+            if articles and summarize:
+                await self.attach_summaries(articles)
+
+            return articles, total
         except HTTPException:
             raise
         except Exception as e:
@@ -71,24 +71,61 @@ class NewsService:
                 detail="Failed to retrieve news"
             )
     
+    async def attach_summaries(self, articles) -> None:
+        """Fill in llm_summary for each article via the coalescer."""
+        try:
+            # Enqueue through the coalescer so articles from all
+            # concurrent requests share one batched LLM call
+            summaries = await asyncio.gather(
+                *(self._llm_service.summarize_one(article) for article in articles)
+            )
+            # None marks an individually failed summary; only that
+            # article gets the fallback text, the rest keep theirs
+            for article, summary in zip(articles, summaries):
+                article.llm_summary = summary if summary is not None else "Summary unavailable."
+        except Exception as e:
+            logger.warning(f"LLM summary generation failed: {e}")
+            for article in articles:
+                article.llm_summary = "Summary unavailable."
+
     async def search_news(
         self,
         query: str,
         category: Optional[str] = None,
         min_score: Optional[float] = None,
         limit: int = 5,
-        offset: int = 0
+        offset: int = 0,
+        summarize: bool = True
     ):
         try:
-            entities_data = await self._llm_service.extract_entities(query)
+            # Hedge: run entity extraction and a best-effort fetch on the
+            # raw query concurrently. When the extracted terms match the
+            # query (or extraction fell back to it), the hedge result is
+            # the answer and the LLM round-trip costs no extra latency.
+            entities_task = asyncio.create_task(self._llm_service.extract_entities(query))
+            hedge_task = asyncio.create_task(self.fetch_news(
+                search_query=query,
+                category=category,
+                min_score=min_score,
+                limit=limit,
+                offset=offset,
+                summarize=summarize
+            ))
+
+            entities_data = await entities_task
             search_terms = " ".join(entities_data.get("search_terms", [query]))
-            
+
+            if self._same_terms(search_terms, query):
+                return await hedge_task
+
+            hedge_task.cancel()
             return await self.fetch_news(
                 search_query=search_terms,
                 category=category,
                 min_score=min_score,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                summarize=summarize
             )
         except HTTPException:
             raise
@@ -99,6 +136,10 @@ class NewsService:
                 detail="Failed to search news"
             )
     
+    @staticmethod
+    def _same_terms(search_terms: str, query: str) -> bool:
+        return " ".join(search_terms.lower().split()) == " ".join(query.lower().split())
+
     async def nearby_news(
         self,
         lat: float,
@@ -108,7 +149,20 @@ class NewsService:
         limit: int = 5,
         offset: int = 0
     ):
-        return await self.fetch_news(
+        # Same geohash-cell keying as the trending cache: precision 6 is
+        # ~1.2 km, so all users near the same spot share one cached entry
+        cache_key = self._nearby_cache_key(lat, lon, radius, category, limit, offset)
+
+        try:
+            cached_data = await self._cache.get(cache_key)
+            if cached_data:
+                logger.info(f"Cache hit for nearby news: {cache_key}")
+                cached = orjson.loads(cached_data)
+                return cached['articles'], cached['total']
+        except Exception as e:
+            logger.warning(f"Redis cache read failed: {e}")
+
+        articles, total = await self.fetch_news(
             lat=lat,
             lon=lon,
             radius=radius,
@@ -116,3 +170,24 @@ class NewsService:
             limit=limit,
             offset=offset
         )
+
+        try:
+            payload = orjson.dumps({"articles": articles, "total": total}, default=str).decode()
+            await self._cache.set(cache_key, payload, ex=120)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {e}")
+
+        return articles, total
+
+    @staticmethod
+    def _nearby_cache_key(
+        lat: float,
+        lon: float,
+        radius: float,
+        category: Optional[str],
+        limit: int,
+        offset: int,
+        precision: int = 6
+    ) -> str:
+        gh = geohash2.encode(lat, lon, precision=precision)
+        return f"nearby:{gh}:{category}:{radius}:{limit}:{offset}"
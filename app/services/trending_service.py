@@ -1,8 +1,10 @@
-import json
-import random
+import asyncio
+import orjson
+from functools import lru_cache
 from typing import List, Optional
 import logging
 import geohash2
+import numpy as np
 from fastapi import HTTPException, status
 from app.repositories.interfaces import IArticleRepository, IEventRepository
 from app.core.redis import RedisCache
@@ -10,6 +12,25 @@ from app.services.llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
+# Major cities that anchor ~70% of simulated events, for realistic
+# trending clusters (lat, lon)
+_CITY_COORDS = np.array([
+    (37.7749, -122.4194),  # San Francisco
+    (40.7128, -74.0060),   # New York
+    (34.0522, -118.2437),  # Los Angeles
+    (51.5074, -0.1278),    # London
+    (19.0760, 72.8777),    # Mumbai
+    (28.7041, 77.1025),    # Delhi
+], dtype=np.float64)
+
+_EVENT_TYPES = ('view', 'click', 'share')
+_EVENT_WEIGHTS = (0.7, 0.25, 0.05)
+
+# Simulated events are written in chunks through a small queue so tuple
+# assembly overlaps the COPY round-trips instead of running serially
+_EVENT_CHUNK_SIZE = 1000
+_EVENT_WRITERS = 2
+
 class TrendingService:
     def __init__(
         self, 
@@ -24,56 +45,70 @@ class TrendingService:
         self._llm_service = llm_service
     
     async def generate_simulated_events(self, num_events: int = 500, user_id: str = None):
-        articles = await self._article_repo.find_all()
-        
-        if not articles:
+        # The simulator only needs ids to sample from; pull the 100 most
+        # relevant articles so simulated engagement lands on plausible ones
+        article_ids = await self._article_repo.find_top_ids(100)
+
+        if not article_ids:
             return
-        
-        event_types = ['view', 'click', 'share']
-        event_weights = [0.7, 0.25, 0.05]
-        
-        events = []
-        for _ in range(num_events):
-            article = random.choice(articles[:100])
-            event_type = random.choices(event_types, weights=event_weights)[0]
-            
-            # Generate random coordinates (global distribution)
-            # Focus more events around major cities for better trending results
-            city_coords = [
-                (37.7749, -122.4194),  # San Francisco
-                (40.7128, -74.0060),   # New York
-                (34.0522, -118.2437),  # Los Angeles
-                (51.5074, -0.1278),    # London
-                (19.0760, 72.8777),    # Mumbai
-                (28.7041, 77.1025),    # Delhi
-            ]
-            
-            # 70% chance of event near a major city, 30% random
-            if random.random() < 0.7:
-                base_lat, base_lon = random.choice(city_coords)
-                # Add noise within ~50km radius
-                lat = base_lat + random.uniform(-0.5, 0.5)
-                lon = base_lon + random.uniform(-0.5, 0.5)
-            else:
-                # Random global coordinates
-                lat = random.uniform(-90, 90)
-                lon = random.uniform(-180, 180)
-            
-            events.append({
-                'user_id': user_id,  # Use the authenticated user's ID
-                'article_id': article['id'],
-                'event_type': event_type,
-                'lat': lat,
-                'lon': lon
-            })
-        
+
+        # Draw everything as NumPy arrays in one pass instead of a Python
+        # loop with four random calls per event
+        rng = np.random.default_rng()
+        article_idx = rng.integers(0, len(article_ids), num_events)
+        event_type_idx = rng.choice(len(_EVENT_TYPES), size=num_events, p=_EVENT_WEIGHTS)
+
+        # 70% of events cluster near a major city (~50km noise), 30% are
+        # uniformly global
+        near_city = rng.random(num_events) < 0.7
+        city_base = _CITY_COORDS[rng.integers(0, len(_CITY_COORDS), num_events)]
+        city_noise = rng.uniform(-0.5, 0.5, (num_events, 2))
+        global_coords = np.column_stack([
+            rng.uniform(-90, 90, num_events),
+            rng.uniform(-180, 180, num_events)
+        ])
+        coords = np.where(near_city[:, None], city_base + city_noise, global_coords)
+
+        # Producer assembles (user_id, article_id, event_type, lat, lon)
+        # tuple chunks from the sampled arrays while consumers COPY earlier
+        # chunks, so CPU work and network writes overlap for large batches
+        queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+        async def producer():
+            for start in range(0, num_events, _EVENT_CHUNK_SIZE):
+                stop = min(start + _EVENT_CHUNK_SIZE, num_events)
+                chunk = [
+                    (user_id, article_ids[article_idx[i]],
+                     _EVENT_TYPES[event_type_idx[i]],
+                     float(coords[i, 0]), float(coords[i, 1]))
+                    for i in range(start, stop)
+                ]
+                await queue.put(chunk)
+            for _ in range(_EVENT_WRITERS):
+                await queue.put(None)
+
+        async def consumer():
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    return
+                await self._event_repo.create_events_copy(chunk)
+
         try:
-            await self._event_repo.create_events_batch(events)
+            # TaskGroup tears the whole pipeline down when any task fails:
+            # a COPY error in one writer cancels the producer and its
+            # sibling instead of leaving the producer parked forever on a
+            # full queue
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(producer())
+                for _ in range(_EVENT_WRITERS):
+                    tg.create_task(consumer())
             logger.info(f"Generated {num_events} simulated events")
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Failed to generate simulated events: {e}")
+        except BaseExceptionGroup as eg:
+            http_errors = eg.subgroup(HTTPException)
+            if http_errors is not None:
+                raise http_errors.exceptions[0]
+            logger.error(f"Failed to generate simulated events: {eg.exceptions[0]}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to generate simulated events"
@@ -93,10 +128,26 @@ class TrendingService:
             
             if cached_data:
                 logger.info(f"Cache hit for trending news: {cache_key}")
-                return json.loads(cached_data)
+                return orjson.loads(cached_data)
         except Exception as e:
             logger.warning(f"Redis cache read failed: {e}")
-        
+
+        # Single-flight: after a popular tile's TTL expires, only the
+        # coroutine that wins the lock recomputes; the rest poll for its
+        # cached result instead of piling onto Postgres and the LLM
+        lock_key = f"lock:{cache_key}"
+        acquired = True
+        try:
+            acquired = await self._cache.set_nx(lock_key, "1", ex=10)
+        except Exception as e:
+            logger.warning(f"Redis lock acquire failed: {e}")
+
+        if not acquired:
+            refreshed = await self._wait_for_cached(cache_key)
+            if refreshed is not None:
+                return refreshed
+            # The lock holder died or timed out; compute it ourselves
+
         try:
             result = await self._event_repo.get_trending_articles(
                 lat=lat,
@@ -107,16 +158,18 @@ class TrendingService:
             
             if result:
                 try:
-                    summaries = await self._llm_service.generate_summaries_batch(result)
+                    summaries = await asyncio.gather(
+                        *(self._llm_service.summarize_one(article) for article in result)
+                    )
                     for article, summary in zip(result, summaries):
-                        article['llm_summary'] = summary
+                        article['llm_summary'] = summary if summary is not None else "Summary unavailable."
                 except Exception as e:
                     logger.warning(f"LLM summary generation failed for trending: {e}")
                     for article in result:
                         article['llm_summary'] = "Summary unavailable."
             
             try:
-                await self._cache.set(cache_key, json.dumps(result, default=str), ex=300)
+                await self._cache.set(cache_key, orjson.dumps(result, default=str).decode(), ex=300)
                 logger.info(f"Cached trending news: {cache_key}")
             except Exception as e:
                 logger.warning(f"Redis cache write failed: {e}")
@@ -130,7 +183,35 @@ class TrendingService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to retrieve trending news"
             )
-    
-    def _get_cache_key(self, lat: float, lon: float, limit: int, precision: int = 5) -> str:
-        gh = geohash2.encode(lat, lon, precision=precision)
+        finally:
+            if acquired:
+                try:
+                    await self._cache.delete(lock_key)
+                except Exception as e:
+                    logger.warning(f"Redis lock release failed: {e}")
+
+    async def _wait_for_cached(self, cache_key: str, timeout: float = 10.0):
+        """Poll for another coroutine's cached result; None on timeout."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.1)
+            try:
+                cached_data = await self._cache.get(cache_key)
+            except Exception:
+                return None
+            if cached_data:
+                logger.info(f"Cache hit after waiting on single-flight lock: {cache_key}")
+                return orjson.loads(cached_data)
+        return None
+
+    def _get_cache_key(self, lat: float, lon: float, limit: int) -> str:
+        # Quantize to ~1km before memoizing: coordinates inside the same
+        # precision-5 geohash cell collapse to one cache entry, so repeat
+        # requests skip the pure-Python geohash encode entirely
+        return self._cache_key_cached(round(lat, 2), round(lon, 2), limit)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _cache_key_cached(lat_q: float, lon_q: float, limit: int) -> str:
+        gh = geohash2.encode(lat_q, lon_q, precision=5)
         return f"trending:{gh}:limit{limit}"
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -7,75 +6,154 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.core.config import settings
+from app.core.database import POOL_SETTINGS
 import asyncpg
+import ijson
+
+COPY_CHUNK_SIZE = 10000
+FALLBACK_BATCH_SIZE = 500
+# Upper bound on chunks being loaded concurrently; also caps how many
+# chunks sit in memory waiting for a connection
+MAX_INFLIGHT_CHUNKS = 8
+
+INSERT_SQL = """
+    INSERT INTO articles
+    (id, title, description, url, publication_date, source_name,
+     category, relevance_score, latitude, longitude)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+"""
+
+def iter_articles(data_file):
+    """
+    Stream articles from news_data.json one at a time with ijson.
+
+    Peeks at the first byte to support both the bare-list form and the
+    {"articles": [...]} wrapper without materializing the whole file.
+    """
+    with open(data_file, 'rb') as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        prefix = 'articles.item' if first == b'{' else 'item'
+        f.seek(0)
+        yield from ijson.items(f, prefix)
+
+def normalize_article(article):
+    category_array = article.get('category', [])
+    if isinstance(category_array, str):
+        category_array = [category_array]
+
+    pub_date = article.get('publication_date')
+    if pub_date and isinstance(pub_date, str):
+        pub_date = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
+
+    return (
+        article.get('id'),
+        article.get('title'),
+        article.get('description'),
+        article.get('url'),
+        pub_date,
+        article.get('source_name'),
+        category_array,
+        # ijson yields numbers as Decimal; the float columns want float
+        float(article['relevance_score']) if article.get('relevance_score') is not None else None,
+        float(article['latitude']) if article.get('latitude') is not None else None,
+        float(article['longitude']) if article.get('longitude') is not None else None
+    )
+
+async def insert_fallback(conn, records):
+    """
+    Bulk-insert a chunk with executemany when its COPY failed.
+
+    Works through the chunk in 500-row transactions so one bad row only
+    costs its own batch, and reports which batch it was in.
+    """
+    inserted = 0
+    for start in range(0, len(records), FALLBACK_BATCH_SIZE):
+        batch = records[start:start + FALLBACK_BATCH_SIZE]
+        try:
+            async with conn.transaction():
+                await conn.executemany(INSERT_SQL, batch)
+            inserted += len(batch)
+        except Exception as e:
+            print(f"Error inserting batch starting at row {start} "
+                  f"(ids {batch[0][0]}..{batch[-1][0]}): {e}")
+    return inserted
+
+async def load_chunk(pool, chunk):
+    # COPY streams the chunk over the binary protocol in one shot instead
+    # of a parse/bind/execute round-trip (and an autocommit) per article.
+    # Each chunk commits on its own so a failed chunk can be retried via
+    # the executemany fallback without rolling back the rest of the load.
+    async with pool.acquire() as conn:
+        try:
+            async with conn.transaction():
+                await conn.copy_records_to_table(
+                    'articles',
+                    records=chunk,
+                    columns=[
+                        'id', 'title', 'description', 'url', 'publication_date',
+                        'source_name', 'category', 'relevance_score',
+                        'latitude', 'longitude'
+                    ]
+                )
+            return len(chunk)
+        except Exception as e:
+            print(f"COPY failed for chunk: {e}")
+            print("Retrying chunk with batched INSERTs...")
+            return await insert_fallback(conn, chunk)
 
 async def ingest_data():
     print("Starting data ingestion...")
-    
-    conn = await asyncpg.connect(settings.DATABASE_URL)
-    
+
+    # Same per-connection tuning as the app pool, so COPY statements and
+    # the fallback INSERT land in a warm statement cache across chunks
+    pool = await asyncpg.create_pool(
+        settings.DATABASE_URL, min_size=4, max_size=8, **POOL_SETTINGS
+    )
+
     data_file = Path(__file__).parent.parent / "data" / "news_data.json"
-    
+
     if not data_file.exists():
         print(f"Error: Data file not found at {data_file}")
         print("Please copy your news_data.json to the data/ directory")
         return
-    
-    with open(data_file, 'r') as f:
-        data = json.load(f)
-    
-    if isinstance(data, dict) and 'articles' in data:
-        articles = data['articles']
-    elif isinstance(data, list):
-        articles = data
-    else:
-        print("Error: Unexpected JSON structure")
-        return
-    
-    print(f"Found {len(articles)} articles to insert")
-    
-    await conn.execute("TRUNCATE TABLE articles CASCADE")
-    
+
+    await pool.execute("TRUNCATE TABLE articles CASCADE")
+
+    # Parse and load in a pipeline: articles stream off disk one at a time
+    # (peak memory stays bounded by the in-flight chunks) while full chunks
+    # COPY concurrently over the pool, so a single connection no longer
+    # serializes the Postgres side
     inserted = 0
-    for article in articles:
+    pending = set()
+    chunk = []
+    for article in iter_articles(data_file):
         try:
-            category_array = article.get('category', [])
-            if isinstance(category_array, str):
-                category_array = [category_array]
-            
-            pub_date = article.get('publication_date')
-            if pub_date and isinstance(pub_date, str):
-                pub_date = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
-            
-            await conn.execute(
-                """
-                INSERT INTO articles 
-                (id, title, description, url, publication_date, source_name, 
-                 category, relevance_score, latitude, longitude)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                """,
-                article.get('id'),
-                article.get('title'),
-                article.get('description'),
-                article.get('url'),
-                pub_date,
-                article.get('source_name'),
-                category_array,
-                article.get('relevance_score'),
-                article.get('latitude'),
-                article.get('longitude')
-            )
-            inserted += 1
-            
-            if inserted % 100 == 0:
-                print(f"Inserted {inserted} articles...")
-        
+            chunk.append(normalize_article(article))
         except Exception as e:
-            print(f"Error inserting article {article.get('id')}: {e}")
+            print(f"Error parsing article {article.get('id')}: {e}")
             continue
-    
-    await conn.close()
-    
+
+        if len(chunk) >= COPY_CHUNK_SIZE:
+            pending.add(asyncio.create_task(load_chunk(pool, chunk)))
+            chunk = []
+            if len(pending) >= MAX_INFLIGHT_CHUNKS:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                inserted += sum(task.result() for task in done)
+                print(f"Inserted {inserted} articles...")
+
+    if chunk:
+        pending.add(asyncio.create_task(load_chunk(pool, chunk)))
+
+    if pending:
+        done, _ = await asyncio.wait(pending)
+        inserted += sum(task.result() for task in done)
+
+    await pool.close()
+
     print(f"Data ingestion complete! Inserted {inserted} articles.")
 
 if __name__ == "__main__":
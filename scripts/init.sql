@@ -1,5 +1,6 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS postgis;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 CREATE TABLE IF NOT EXISTS users (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -11,8 +12,9 @@ CREATE TABLE IF NOT EXISTS users (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_users_username ON users(username);
+-- No extra btree indexes on email/username: the UNIQUE constraints above
+-- already create indexes that serve the login and signup lookups, and
+-- duplicate indexes just slow every insert
 
 CREATE TABLE IF NOT EXISTS articles (
     id UUID PRIMARY KEY,
@@ -26,16 +28,28 @@ CREATE TABLE IF NOT EXISTS articles (
     latitude DOUBLE PRECISION,
     longitude DOUBLE PRECISION,
     location GEOGRAPHY(POINT, 4326),
-    search_vector TSVECTOR,
+    -- Stored generated column: always in sync with title/description and
+    -- guaranteed to match the GIN index expression, so the
+    -- search_vector @@ plainto_tsquery(...) predicate stays index-backed
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(description, ''))
+    ) STORED,
     created_at TIMESTAMP DEFAULT NOW()
 );
 
 CREATE INDEX idx_articles_category ON articles USING GIN(category);
 CREATE INDEX idx_articles_source ON articles(source_name);
+-- Trigram index so the substring source filter (LIKE '%x%') is an index
+-- scan instead of a sequential scan over all articles
+CREATE INDEX idx_articles_source_trgm ON articles USING GIN(lower(source_name) gin_trgm_ops);
 CREATE INDEX idx_articles_score ON articles(relevance_score DESC);
 CREATE INDEX idx_articles_location ON articles USING GIST(location);
 CREATE INDEX idx_articles_search ON articles USING GIN(search_vector);
-CREATE INDEX idx_articles_pub_date ON articles(publication_date DESC);
+-- Composite index matches both the default recency ordering and the
+-- (publication_date, id) keyset cursor used for deep pagination. NULLS
+-- LAST must match the ORDER BY exactly (btree DESC defaults to NULLS
+-- FIRST) or the planner falls back to a full sort.
+CREATE INDEX idx_articles_pub_date_id ON articles(publication_date DESC NULLS LAST, id DESC);
 
 CREATE TABLE IF NOT EXISTS user_events (
     id SERIAL PRIMARY KEY,
@@ -49,21 +63,47 @@ CREATE TABLE IF NOT EXISTS user_events (
 );
 
 CREATE INDEX idx_events_article ON user_events(article_id);
-CREATE INDEX idx_events_created_at ON user_events(created_at DESC);
+-- Events are append-only so created_at correlates with physical order; a
+-- BRIN index keeps the trending 48-hour range filter on recent pages only
+-- while staying a few KB regardless of table size
+CREATE INDEX idx_events_created_at_brin ON user_events USING BRIN(created_at);
 CREATE INDEX idx_events_location ON user_events USING GIST(user_location);
 CREATE INDEX idx_events_user ON user_events(user_id);
 
-CREATE OR REPLACE FUNCTION update_search_vector() RETURNS trigger AS $$
-BEGIN
-    NEW.search_vector := to_tsvector('english', COALESCE(NEW.title, '') || ' ' || COALESCE(NEW.description, ''));
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
+-- Precomputed global trending scores (no location weighting). Refreshed
+-- periodically from the app so the no-radius trending path reads a tiny
+-- indexed view instead of aggregating 48 hours of raw events per request.
+CREATE MATERIALIZED VIEW IF NOT EXISTS trending_articles_mv AS
+WITH event_stats AS (
+    SELECT
+        ue.article_id,
+        COUNT(CASE WHEN ue.event_type = 'view' THEN 1 END) as views,
+        COUNT(CASE WHEN ue.event_type = 'click' THEN 1 END) as clicks,
+        COUNT(CASE WHEN ue.event_type = 'share' THEN 1 END) as shares,
+        MAX(ue.created_at) as latest_event
+    FROM user_events ue
+    WHERE ue.created_at > NOW() - INTERVAL '48 hours'
+    GROUP BY ue.article_id
+)
+SELECT
+    a.id, a.title, a.description, a.url, a.publication_date,
+    a.source_name, a.category, a.relevance_score,
+    ST_Y(a.location::geometry) as latitude,
+    ST_X(a.location::geometry) as longitude,
+    a.location,
+    (
+        (es.views * 1.0 + es.clicks * 3.0 + es.shares * 5.0) *
+        (1.0 / (1.0 + EXTRACT(EPOCH FROM (NOW() - es.latest_event)) / 3600.0))
+    ) as trending_score
+FROM articles a
+JOIN event_stats es ON a.id = es.article_id;
 
-CREATE TRIGGER articles_search_vector_update
-    BEFORE INSERT OR UPDATE ON articles
-    FOR EACH ROW
-    EXECUTE FUNCTION update_search_vector();
+-- Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX idx_trending_mv_id ON trending_articles_mv(id);
+CREATE INDEX idx_trending_mv_score ON trending_articles_mv(trending_score DESC);
+-- Radius-filtered trending reads the MV too; the GiST index keeps the
+-- ST_DWithin filter over article locations index-backed
+CREATE INDEX idx_trending_mv_location ON trending_articles_mv USING GIST(location);
 
 CREATE OR REPLACE FUNCTION update_location() RETURNS trigger AS $$
 BEGIN
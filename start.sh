@@ -8,4 +8,4 @@ echo "Starting deployment setup..."
 # Note: You'll need to manually run init.sql and load_data.py after first deployment
 
 echo "Starting FastAPI server..."
-uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000}
+uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000} --loop uvloop --http httptools